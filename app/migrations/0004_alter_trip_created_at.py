@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Recreate created_at as an indexed DateTimeField. Migration 0003 had
+    narrowed it to a TimeField; Postgres cannot cast time to timestamptz, so
+    altering the type in place fails there, and the time-of-day values carry
+    no usable date anyway. Existing rows get the migration run time.
+    """
+
+    dependencies = [
+        ('app', '0003_alter_trip_created_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='trip',
+            name='created_at',
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+            preserve_default=False,
+        ),
+    ]
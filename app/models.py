@@ -6,7 +6,16 @@ class Trip(models.Model):
     pickup_location = models.CharField(max_length=100)
     dropoff_location = models.CharField(max_length=100)
     current_cycle_used = models.IntegerField()
-    created_at = models.TimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    # Geocoded coordinates captured at trip creation so downstream endpoints
+    # (route steps, reports) never have to re-geocode the free-text locations
+    current_lat = models.FloatField(null=True, blank=True)
+    current_lng = models.FloatField(null=True, blank=True)
+    pickup_lat = models.FloatField(null=True, blank=True)
+    pickup_lng = models.FloatField(null=True, blank=True)
+    dropoff_lat = models.FloatField(null=True, blank=True)
+    dropoff_lng = models.FloatField(null=True, blank=True)
     
     def __str__(self):
         return f"Trip from {self.pickup_location} to {self.dropoff_location}"
\ No newline at end of file
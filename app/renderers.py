@@ -0,0 +1,20 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson, which serializes the float- and
+    string-heavy route payloads several times faster than stdlib json.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # orjson handles datetimes natively; anything else unusual (e.g.
+        # Decimal, lazy strings) falls back to str
+        return orjson.dumps(data, default=str)
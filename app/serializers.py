@@ -1,7 +1,25 @@
 from rest_framework import serializers
 from .models import Trip
 
+
+class TripListSerializer(serializers.ListSerializer):
+    """
+    Persists many trips with batched INSERTs instead of one query per row.
+    """
+
+    def create(self, validated_data):
+        trips = [Trip(**item) for item in validated_data]
+        return Trip.objects.bulk_create(trips, batch_size=500)
+
+
 class TripSerializer(serializers.ModelSerializer):
     class Meta:
         model = Trip
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+        read_only_fields = (
+            "id", "created_at",
+            "current_lat", "current_lng",
+            "pickup_lat", "pickup_lng",
+            "dropoff_lat", "dropoff_lng",
+        )
+        list_serializer_class = TripListSerializer
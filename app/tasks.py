@@ -0,0 +1,131 @@
+import hashlib
+import io
+from datetime import datetime
+
+from celery import shared_task
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .models import Trip
+
+ELD_CACHE_TTL = 60 * 60  # Re-prints within the hour skip ReportLab entirely
+
+
+def eld_cache_key(trip):
+    """
+    Stable cache key for a trip's rendered log sheet; changes whenever a
+    field that appears on the PDF changes.
+    """
+    fingerprint = f"{trip.id}:{trip.pickup_location}:{trip.dropoff_location}:{trip.current_cycle_used}"
+    return "eld:" + hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+
+
+# Pre-rendered static log sheet, built once per worker process; every render
+# stamps its trip-specific overlay onto a copy of this page
+_STATIC_TEMPLATE = None
+
+
+def _render_static_template():
+    """
+    Render the fixed log-sheet furniture (title, hour grid, status codes,
+    signature block) to a single-page PDF and return its bytes.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+
+    # PDF Title
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(80, 750, "Driver's Daily Log (24 Hours)")
+
+    # Hours of Service Log
+    c.setFont("Helvetica", 12)
+    c.drawString(80, 670, "---")
+    c.drawString(80, 650, "Hours of Service Log")
+    c.drawString(80, 630, "| Hour  | 12 AM | 1 AM | 2 AM | 3 AM | 4 AM | 5 AM | 6 AM | 7 AM | 8 AM | 9 AM | 10 AM | 11 AM |")
+    c.drawString(80, 610, "|-------|------|------|------|------|------|------|------|------|------|------|------|------|")
+    c.drawString(80, 590, "| Status | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ |")
+    c.drawString(80, 570, "| Hour  | 12 PM | 1 PM | 2 PM | 3 PM | 4 PM | 5 PM | 6 PM | 7 PM | 8 PM | 9 PM | 10 PM | 11 PM |")
+    c.drawString(80, 550, "| Status | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ |")
+
+    # Status Codes
+    c.drawString(80, 530, "Status Codes:")
+    c.drawString(80, 510, "1. Off Duty (OFF)")
+    c.drawString(80, 490, "2. Sleeper Berth (SB)")
+    c.drawString(80, 470, "3. Driving (D)")
+    c.drawString(80, 450, "4. On Duty (Not Driving) (ON)")
+
+    # Recap Summary (header and blank reset line; per-trip hours are dynamic)
+    c.drawString(80, 430, "---")
+    c.drawString(80, 410, "Recap Summary")
+    c.drawString(80, 330, "- If 34-Hour Reset Taken, Available Hours: _______________")
+
+    # Driver's Signature
+    c.drawString(80, 310, "---")
+    c.drawString(80, 290, "Driver's Signature: ________________________")
+    c.drawString(80, 270, "Date: _______________")
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+@shared_task
+def render_eld(trip_id):
+    """
+    Render the ELD log PDF for a trip and save it to default storage.
+
+    Runs on the dedicated 'pdf' queue so heavy ReportLab work never blocks
+    a web worker. Returns the storage path of the rendered file.
+    """
+    global _STATIC_TEMPLATE
+
+    # Imported lazily so web workers, which only enqueue this task, never
+    # pay the ReportLab/pypdf import at cold start
+    from pypdf import PdfReader, PdfWriter
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    trip = Trip.objects.get(id=trip_id)
+
+    if _STATIC_TEMPLATE is None:
+        _STATIC_TEMPLATE = _render_static_template()
+
+    # Draw only the trip-specific fields on an overlay page
+    overlay_buffer = io.BytesIO()
+    c = canvas.Canvas(overlay_buffer, pagesize=letter)
+    c.setFont("Helvetica", 12)
+
+    # Date, From, To
+    c.drawString(80, 730, f"Date: {datetime.now().strftime('%m/%d/%Y')}")
+    c.drawString(80, 710, f"From: {trip.pickup_location}")
+    c.drawString(80, 690, f"To: {trip.dropoff_location}")
+
+    # Recap Summary
+    c.drawString(80, 390, f"- On Duty Hours Today: {trip.current_cycle_used} hrs")
+    c.drawString(80, 370, f"- Total Hours in Last 7 Days (70-hour rule): {trip.current_cycle_used} hrs")
+    c.drawString(80, 350, f"- Total Hours in Last 8 Days (60-hour rule): {trip.current_cycle_used} hrs")
+
+    c.showPage()
+    c.save()
+
+    # Stamp the overlay onto a copy of the pre-rendered static sheet
+    page = PdfReader(io.BytesIO(_STATIC_TEMPLATE)).pages[0]
+    page.merge_page(PdfReader(overlay_buffer).pages[0])
+
+    writer = PdfWriter()
+    writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    path = f"eld_logs/ELD_Log_Trip_{trip.id}.pdf"
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    saved_path = default_storage.save(path, ContentFile(buffer.getvalue()))
+
+    # Cache the storage path so repeat downloads stream straight from storage
+    cache.set(eld_cache_key(trip), saved_path, ELD_CACHE_TTL)
+    return saved_path
@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import TripAPI, ELDLogAPI  # Import the views
+from .views import TripAPI, TripBulkAPI, RouteStepsAPI, ELDLogAPI, ELDLogStatusAPI  # Import the views
 
 urlpatterns = [
     path('trips/', TripAPI.as_view(), name='trip-api'),  # For listing all trips and creating a new trip
+    path('trips/bulk/', TripBulkAPI.as_view(), name='trip-bulk-api'),  # For importing many trips in one request
     path('trips/<int:pk>/', TripAPI.as_view(), name='trip-detail-api'),  # For retrieving a single trip
-    path('eld-log/<int:trip_id>/', ELDLogAPI.as_view(), name='eld-log-api'),  # ELDLogAPI for generating logs
+    path('trips/<int:pk>/route-steps/', RouteStepsAPI.as_view(), name='trip-route-steps'),  # Turn-by-turn instructions on demand
+    path('eld-log/<int:trip_id>/', ELDLogAPI.as_view(), name='eld-log-api'),  # ELDLogAPI for queueing log generation
+    path('eld-log/status/<str:task_id>/', ELDLogStatusAPI.as_view(), name='eld-log-status'),  # Poll a queued log render
 ]
\ No newline at end of file
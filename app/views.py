@@ -1,21 +1,168 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
 from django.conf import settings
-from django.http import FileResponse, JsonResponse
-import io
-import requests
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from django.urls import reverse
+import asyncio
+import httpx
+from asgiref.sync import async_to_sync
+from celery.result import AsyncResult
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.generics import RetrieveAPIView
 from .models import Trip
 from .serializers import TripSerializer
-from datetime import datetime
+from .tasks import render_eld, eld_cache_key
 
 # Use OpenRouteService API key if available, otherwise use the free tier
 OPENROUTESERVICE_API_KEY = getattr(settings, "OPENROUTESERVICE_API_KEY", "")
 
+GEOCODE_URL = "https://api.openrouteservice.org/geocode/search"
+DIRECTIONS_URL = "https://api.openrouteservice.org/v2/directions/driving-car/json"
+MATRIX_URL = "https://api.openrouteservice.org/v2/matrix/driving-car"
+GEOCODE_CACHE_TTL = 60 * 60 * 24  # Addresses rarely move; cache geocode results for 24 hours
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)  # So a slow ORS endpoint can't hang a worker
+
+# Transient upstream failures are retried with a short backoff; connect-level
+# failures are retried by the transport itself
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.2
+
+# Unit conversions for ORS responses (meters/seconds) and fueling cadence
+# (one stop every 1,000 miles; 1609.344 km exactly)
+_KM_PER_M = 1e-3
+_HRS_PER_S = 1 / 3600
+_KM_PER_FUEL_STOP = 1609.344
+
+# Every column the serializer emits; the list and detail queries restrict to
+# these with only(), so any field serialized but missing here would be
+# deferred and re-fetched with an extra query per row
+TRIP_LIST_FIELDS = (
+    'id', 'current_location', 'pickup_location', 'dropoff_location',
+    'current_cycle_used', 'created_at',
+    'current_lat', 'current_lng', 'pickup_lat', 'pickup_lng',
+    'dropoff_lat', 'dropoff_lng',
+)
+
+
+class TripPagination(PageNumberPagination):
+    page_size = 50
+
+
+async def _request_with_retry(client, method, url, **kwargs):
+    """
+    Issue a request, retrying 502/503/504 responses with exponential backoff
+    so a flaky ORS endpoint degrades gracefully instead of failing the POST.
+    """
+    for attempt in range(RETRY_TOTAL + 1):
+        response = await client.request(method, url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+            return response
+        await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+
+async def _geocode(client, address):
+    """
+    Geocode an address via OpenRouteService, caching the result so repeated
+    addresses (e.g. the same depots across many trips) skip the HTTP call.
+    """
+    key = "geo:" + address.strip().lower()
+    result = await cache.aget(key)
+    if result is None:
+        response = await _request_with_retry(client, "GET", GEOCODE_URL, params={"text": address})
+        result = response.json()
+        # Only cache successful lookups; caching a 429 or exhausted-retry 5xx
+        # body would make a valid address fail for the whole TTL
+        if response.status_code == 200:
+            await cache.aset(key, result, GEOCODE_CACHE_TTL)
+    return result
+
+
+def _ors_client(headers):
+    """
+    Build an httpx client configured for OpenRouteService calls.
+    """
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=REQUEST_TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(retries=RETRY_TOTAL),
+    )
+
+
+async def _geocode_all(client, addresses):
+    """
+    Geocode a list of addresses concurrently. Returns their [lng, lat]
+    coordinate pairs, or None if any address failed to geocode.
+    """
+    geocodes = await asyncio.gather(*(_geocode(client, address) for address in addresses))
+
+    if not all(geocode.get("features") for geocode in geocodes):
+        return None
+
+    return [geocode["features"][0]["geometry"]["coordinates"] for geocode in geocodes]
+
+
+async def _post_matrix(client, coordinates):
+    """
+    Fetch pairwise driving distances and durations for known [lng, lat]
+    coordinate pairs in a single matrix call. The matrix endpoint returns
+    numbers only (no instruction blobs), so the payload is a fraction of a
+    directions response.
+    """
+    response = await _request_with_retry(
+        client,
+        "POST",
+        MATRIX_URL,
+        json={
+            "locations": [[coords[0], coords[1]] for coords in coordinates],
+            "metrics": ["distance", "duration"],
+        },
+    )
+    return response.json()
+
+
+async def _post_directions(client, coordinates):
+    """
+    Fetch the combined route with turn-by-turn instructions for known
+    [lng, lat] coordinate pairs.
+    """
+    response = await _request_with_retry(
+        client,
+        "POST",
+        DIRECTIONS_URL,
+        json={"coordinates": [[coords[0], coords[1]] for coords in coordinates]},
+    )
+    return response.json()
+
+
+async def _geocode_and_fetch(addresses, headers, post):
+    """
+    Geocode addresses concurrently, then run the given POST helper (matrix
+    or directions) with the resulting coordinates on the same client.
+
+    Returns ``(coordinates, payload)`` where coordinates is a list of
+    [lng, lat] pairs in address order, or ``(None, None)`` if any address
+    failed to geocode.
+    """
+    async with _ors_client(headers) as client:
+        coordinates = await _geocode_all(client, addresses)
+
+        if coordinates is None:
+            return None, None
+
+        return coordinates, await post(client, coordinates)
+
+
+async def _fetch_directions(coordinates, headers):
+    """
+    Fetch directions for already-known coordinates (no geocoding).
+    """
+    async with _ors_client(headers) as client:
+        return await _post_directions(client, coordinates)
+
 
 class TripAPI(APIView):
     """
@@ -40,83 +187,87 @@ class TripAPI(APIView):
                 return Response({"error": "Current location, pickup, and dropoff locations are required"}, status=status.HTTP_400_BAD_REQUEST)
 
             try:
-                # Geocode current, pickup, and dropoff locations
-                geocode_url = "https://api.openrouteservice.org/geocode/search"
+                # Geocode all three locations concurrently (cached per address),
+                # then fetch all leg distances/durations in one matrix call
                 headers = {}
                 if OPENROUTESERVICE_API_KEY:
                     headers["Authorization"] = OPENROUTESERVICE_API_KEY
 
-                current_geocode = requests.get(geocode_url, params={"text": current_location}, headers=headers).json()
-                pickup_geocode = requests.get(geocode_url, params={"text": pickup}, headers=headers).json()
-                dropoff_geocode = requests.get(geocode_url, params={"text": dropoff}, headers=headers).json()
+                coordinates, matrix = async_to_sync(_geocode_and_fetch)(
+                    [current_location, pickup, dropoff], headers, _post_matrix
+                )
 
-                if not current_geocode.get("features") or not pickup_geocode.get("features") or not dropoff_geocode.get("features"):
+                if coordinates is None:
                     return Response({"error": "Could not geocode locations. Please check the addresses."}, status=status.HTTP_400_BAD_REQUEST)
 
-                current_coords = current_geocode["features"][0]["geometry"]["coordinates"]
-                pickup_coords = pickup_geocode["features"][0]["geometry"]["coordinates"]
-                dropoff_coords = dropoff_geocode["features"][0]["geometry"]["coordinates"]
-
-                # Get route details from current to pickup
-                directions_url = "https://api.openrouteservice.org/v2/directions/driving-car/json"
-
-                directions_params_current_to_pickup = {
-                    "coordinates": [[current_coords[0], current_coords[1]], [pickup_coords[0], pickup_coords[1]]]
-                }
-
-                directions_current_to_pickup = requests.post(directions_url, json=directions_params_current_to_pickup, headers=headers).json()
-
-                # Get route details from pickup to dropoff
-                directions_params_pickup_to_dropoff = {
-                    "coordinates": [[pickup_coords[0], pickup_coords[1]], [dropoff_coords[0], dropoff_coords[1]]]
-                }
-
-                directions_pickup_to_dropoff = requests.post(directions_url, json=directions_params_pickup_to_dropoff, headers=headers).json()
-
+                if not matrix.get("distances") or not matrix.get("durations"):
+                    return Response({"error": "No route found. Please check the locations."}, status=status.HTTP_400_BAD_REQUEST)
 
-                if not directions_current_to_pickup.get("routes") or not directions_pickup_to_dropoff.get("routes"):
+                # Cells we need; row/column order matches the locations we
+                # sent (current=0, pickup=1, dropoff=2). ORS returns null for
+                # unreachable pairs, which also means no route.
+                legs = (
+                    matrix['distances'][0][1], matrix['durations'][0][1],
+                    matrix['distances'][1][2], matrix['durations'][1][2],
+                )
+                if any(value is None for value in legs):
                     return Response({"error": "No route found. Please check the locations."}, status=status.HTTP_400_BAD_REQUEST)
 
                 # Extract route details
-                distance_current_to_pickup_km = directions_current_to_pickup['routes'][0]['summary']['distance'] / 1000
-                duration_current_to_pickup_hrs = directions_current_to_pickup['routes'][0]['summary']['duration'] / 3600
+                distance_current_to_pickup_km = legs[0] * _KM_PER_M
+                duration_current_to_pickup_hrs = legs[1] * _HRS_PER_S
 
-                distance_pickup_to_dropoff_km = directions_pickup_to_dropoff['routes'][0]['summary']['distance'] / 1000
-                duration_pickup_to_dropoff_hrs = directions_pickup_to_dropoff['routes'][0]['summary']['duration'] / 3600
+                distance_pickup_to_dropoff_km = legs[2] * _KM_PER_M
+                duration_pickup_to_dropoff_hrs = legs[3] * _HRS_PER_S
 
                 total_distance_km = distance_current_to_pickup_km + distance_pickup_to_dropoff_km
                 total_duration_hrs = duration_current_to_pickup_hrs + duration_pickup_to_dropoff_hrs + 2  # Add 2 hours for pickup and dropoff
+                hours_remaining = 70 - (current_cycle_used + total_duration_hrs)
 
                 # Validate the 70-hour/8-day rule
-                if current_cycle_used + total_duration_hrs > 70:
+                if hours_remaining < 0:
                     return Response({"error": "Exceeded 70-hour driving limit. Rest required."}, status=status.HTTP_400_BAD_REQUEST)
 
-                # Calculate fueling stops (1 stop every 1,000 miles ≈ 1,609 km)
-                fueling_stops = int(total_distance_km // 1609)
+                # Calculate fueling stops (1 stop every 1,000 miles)
+                fueling_stops = int(total_distance_km / _KM_PER_FUEL_STOP)
 
-                # Save the trip
-                trip = serializer.save()
+                # Save the trip, persisting the geocoded coordinates so
+                # downstream endpoints can skip re-geocoding
+                trip = serializer.save(
+                    current_lng=coordinates[0][0], current_lat=coordinates[0][1],
+                    pickup_lng=coordinates[1][0], pickup_lat=coordinates[1][1],
+                    dropoff_lng=coordinates[2][0], dropoff_lat=coordinates[2][1],
+                )
 
-                # Return trip details along with calculated route and fueling stops
+                # Return trip details along with calculated route and fueling
+                # stops, built from the saved instance; serializer.data would
+                # re-run a full serialization pass over every field
                 return Response({
-                    "trip": serializer.data,
+                    "trip": {
+                        "id": trip.id,
+                        "current_location": trip.current_location,
+                        "pickup_location": trip.pickup_location,
+                        "dropoff_location": trip.dropoff_location,
+                        "current_cycle_used": trip.current_cycle_used,
+                        "created_at": trip.created_at,
+                    },
                     "route": {
                         "current_to_pickup": {
                             "distance": f"{distance_current_to_pickup_km:.2f} km",
                             "duration": f"{duration_current_to_pickup_hrs:.2f} hrs",
-                            "steps": [step.get("instruction", "No instruction") for step in directions_current_to_pickup['routes'][0]['segments'][0]['steps']]
                         },
                         "pickup_to_dropoff": {
                             "distance": f"{distance_pickup_to_dropoff_km:.2f} km",
                             "duration": f"{duration_pickup_to_dropoff_hrs:.2f} hrs",
-                            "steps": [step.get("instruction", "No instruction") for step in directions_pickup_to_dropoff['routes'][0]['segments'][0]['steps']]
                         },
                         "total_distance": f"{total_distance_km:.2f} km",
                         "total_duration": f"{total_duration_hrs:.2f} hrs",
-                        "fueling_stops": fueling_stops
+                        "fueling_stops": fueling_stops,
+                        # Turn-by-turn instructions are fetched on demand
+                        "steps_url": reverse('trip-route-steps', args=[trip.id])
                     },
                     "current_cycle_used": current_cycle_used,
-                    "hours_remaining": 70 - (current_cycle_used + total_duration_hrs)
+                    "hours_remaining": hours_remaining
                 }, status=status.HTTP_201_CREATED)
 
             except Exception as e:
@@ -130,78 +281,155 @@ class TripAPI(APIView):
         """
         if pk:
             # Retrieve a single trip by ID
-            try:
-                trip = Trip.objects.get(id=pk)
-                serializer = TripSerializer(trip)
-                return Response(serializer.data)
-            except Trip.DoesNotExist:
-                return Response({"error": "Trip not found"}, status=status.HTTP_404_NOT_FOUND)
-        else:
-            # Retrieve all trips
-            trips = Trip.objects.all()
-            serializer = TripSerializer(trips, many=True)
+            trip = get_object_or_404(Trip.objects.only(*TRIP_LIST_FIELDS), pk=pk)
+            serializer = TripSerializer(trip)
             return Response(serializer.data)
+        else:
+            # Retrieve trips a page at a time so response size and memory stay
+            # bounded as the table grows
+            trips = Trip.objects.only(*TRIP_LIST_FIELDS).order_by('-created_at')
+            paginator = TripPagination()
+            page = paginator.paginate_queryset(trips, request, view=self)
+            serializer = TripSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+
+class TripBulkAPI(APIView):
+    """
+    Imports many trips in one request (e.g. a fleet back-fill). Rows are
+    persisted with batched INSERTs; route calculation is skipped.
+    """
+
+    def post(self, request):
+        """
+        Accept a list of trip records and bulk-create them.
+        """
+        serializer = TripSerializer(data=request.data, many=True)
+
+        if serializer.is_valid():
+            trips = serializer.save()
+            return Response({"created": len(trips)}, status=status.HTTP_201_CREATED)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RouteStepsAPI(APIView):
+    """
+    Returns turn-by-turn instructions for a trip's route on demand, keeping
+    the heavier directions call off the trip creation path.
+    """
+
+    def get(self, request, pk):
+        """
+        Fetch the route for a trip and return the instructions for each leg.
+        """
+        trip = get_object_or_404(
+            Trip.objects.only(
+                'id', 'current_location', 'pickup_location', 'dropoff_location',
+                'current_lat', 'current_lng', 'pickup_lat', 'pickup_lng',
+                'dropoff_lat', 'dropoff_lng',
+            ),
+            pk=pk,
+        )
+
+        headers = {}
+        if OPENROUTESERVICE_API_KEY:
+            headers["Authorization"] = OPENROUTESERVICE_API_KEY
+
+        try:
+            coordinates = [
+                [trip.current_lng, trip.current_lat],
+                [trip.pickup_lng, trip.pickup_lat],
+                [trip.dropoff_lng, trip.dropoff_lat],
+            ]
+
+            if all(value is not None for pair in coordinates for value in pair):
+                # Coordinates were stored at creation; no geocoding needed
+                directions = async_to_sync(_fetch_directions)(coordinates, headers)
+            else:
+                # Older trips predate stored coordinates; fall back to geocoding
+                coordinates, directions = async_to_sync(_geocode_and_fetch)(
+                    [trip.current_location, trip.pickup_location, trip.dropoff_location],
+                    headers,
+                    _post_directions,
+                )
+
+                if coordinates is None:
+                    return Response({"error": "Could not geocode locations. Please check the addresses."}, status=status.HTTP_400_BAD_REQUEST)
+
+            if not directions.get("routes"):
+                return Response({"error": "No route found. Please check the locations."}, status=status.HTTP_400_BAD_REQUEST)
+
+            segments = directions['routes'][0]['segments']
+            return Response({
+                "current_to_pickup": [step.get("instruction", "No instruction") for step in segments[0]['steps']],
+                "pickup_to_dropoff": [step.get("instruction", "No instruction") for step in segments[1]['steps']],
+            })
+
+        except Exception as e:
+            return Response({"error": f"An error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class ELDLogAPI(APIView):
     """
-    Generates and returns an ELD log sheet as a PDF file based on trip details.
+    Queues generation of an ELD log sheet PDF for a trip.
     """
 
     def get(self, request, trip_id):
         """
-        Generate a PDF ELD log for a specific trip and return it as a downloadable file.
+        Enqueue PDF generation for a specific trip and return a status URL to poll.
         """
-        try:
-            trip = Trip.objects.get(id=trip_id)
-        except Trip.DoesNotExist:
-            return Response({"error": "Trip not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        # Create a buffer for the PDF
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-
-        # PDF Title
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(80, 750, "Driver's Daily Log (24 Hours)")
-
-        # Date, From, To
-        c.setFont("Helvetica", 12)
-        c.drawString(80, 730, f"Date: {datetime.now().strftime('%m/%d/%Y')}")
-        c.drawString(80, 710, f"From: {trip.pickup_location}")
-        c.drawString(80, 690, f"To: {trip.dropoff_location}")
-
-        # Hours of Service Log
-        c.drawString(80, 670, "---")
-        c.drawString(80, 650, "Hours of Service Log")
-        c.drawString(80, 630, "| Hour  | 12 AM | 1 AM | 2 AM | 3 AM | 4 AM | 5 AM | 6 AM | 7 AM | 8 AM | 9 AM | 10 AM | 11 AM |")
-        c.drawString(80, 610, "|-------|------|------|------|------|------|------|------|------|------|------|------|------|")
-        c.drawString(80, 590, "| Status | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ |")
-        c.drawString(80, 570, "| Hour  | 12 PM | 1 PM | 2 PM | 3 PM | 4 PM | 5 PM | 6 PM | 7 PM | 8 PM | 9 PM | 10 PM | 11 PM |")
-        c.drawString(80, 550, "| Status | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ | ____ |")
-
-        # Status Codes
-        c.drawString(80, 530, "Status Codes:")
-        c.drawString(80, 510, "1. Off Duty (OFF)")
-        c.drawString(80, 490, "2. Sleeper Berth (SB)")
-        c.drawString(80, 470, "3. Driving (D)")
-        c.drawString(80, 450, "4. On Duty (Not Driving) (ON)")
-
-        # Recap Summary
-        c.drawString(80, 430, "---")
-        c.drawString(80, 410, "Recap Summary")
-        c.drawString(80, 390, f"- On Duty Hours Today: {trip.current_cycle_used} hrs")
-        c.drawString(80, 370, f"- Total Hours in Last 7 Days (70-hour rule): {trip.current_cycle_used} hrs")
-        c.drawString(80, 350, f"- Total Hours in Last 8 Days (60-hour rule): {trip.current_cycle_used} hrs")
-        c.drawString(80, 330, "- If 34-Hour Reset Taken, Available Hours: _______________")
-
-        # Driver's Signature
-        c.drawString(80, 310, "---")
-        c.drawString(80, 290, "Driver's Signature: ________________________")
-        c.drawString(80, 270, "Date: _______________")
-
-        c.showPage()
-        c.save()
-        
-        buffer.seek(0)
-        return FileResponse(buffer, as_attachment=True, filename=f"ELD_Log_Trip_{trip.id}.pdf")
\ No newline at end of file
+        trip = get_object_or_404(
+            Trip.objects.only('id', 'pickup_location', 'dropoff_location', 'current_cycle_used'),
+            pk=trip_id,
+        )
+
+        # The PDF depends only on a few trip fields, so a finished render can
+        # be served immediately without touching the queue (common on
+        # re-prints). FileResponse streams the file in chunks, so the PDF is
+        # never buffered whole in the web process.
+        path = cache.get(eld_cache_key(trip))
+        if path is not None and default_storage.exists(path):
+            return FileResponse(
+                default_storage.open(path),
+                as_attachment=True,
+                filename=f"ELD_Log_Trip_{trip.id}.pdf",
+            )
+
+        # Rendering happens on a Celery worker (see app.tasks.render_eld) so
+        # the request thread returns immediately
+        task = render_eld.delay(trip.id)
+        return Response(
+            {"status_url": reverse('eld-log-status', args=[task.id])},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ELDLogStatusAPI(APIView):
+    """
+    Polls a queued ELD log render and returns the PDF once it is ready.
+    """
+
+    def get(self, request, task_id):
+        """
+        Return the rendered PDF if the task finished, otherwise its current status.
+        """
+        result = AsyncResult(task_id)
+
+        if not result.ready():
+            return Response({"status": result.status}, status=status.HTTP_202_ACCEPTED)
+
+        if result.failed():
+            return Response({"error": "PDF generation failed"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        path = result.result
+        if not default_storage.exists(path):
+            # Media files are not permanent; the render may have been cleaned
+            # up since the task finished
+            return Response({"error": "Rendered log no longer available. Request the log again."}, status=status.HTTP_404_NOT_FOUND)
+
+        return FileResponse(
+            default_storage.open(path),
+            as_attachment=True,
+            filename=path.rsplit('/', 1)[-1],
+        )
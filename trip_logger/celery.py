@@ -0,0 +1,9 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trip_logger.settings')
+
+app = Celery('trip_logger')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
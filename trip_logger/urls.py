@@ -27,12 +27,13 @@ urlpatterns = [
     # API endpoints
     path('api/', include('app.urls')),
 
-    # Swagger UI
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+    # Swagger UI (schema cached for an hour; regenerating it re-introspects
+    # every URL and serializer on each hit)
+    path('swagger/', schema_view.with_ui('swagger', cache_timeout=3600), name='schema-swagger-ui'),
 
     # ReDoc UI
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('redoc/', schema_view.with_ui('redoc', cache_timeout=3600), name='schema-redoc'),
 
     # Raw JSON/YAML API Schema
-    path('swagger.json/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger.json/', schema_view.without_ui(cache_timeout=3600), name='schema-json'),
 ]
\ No newline at end of file